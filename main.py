@@ -1,7 +1,9 @@
-import struct, os, sys, io
+import struct, os, sys, mmap, atexit
+from array import array
 from datetime import datetime, date
 from textwrap import dedent
 from collections import Counter
+from functools import lru_cache
 
 # ===== Paths =====
 CUST_PATH = "Customer.dat"
@@ -11,11 +13,13 @@ REPORT_PATH = "report.txt"
 
 # ===== Struct layouts (Little-Endian, fixed-length strings) =====
 CUSTOMER_FMT = "<i15s60s12s"
-CUSTOMER_SIZE = struct.calcsize(CUSTOMER_FMT)
+CUSTOMER_S = struct.Struct(CUSTOMER_FMT)
+CUSTOMER_SIZE = CUSTOMER_S.size
 CUSTOMER_FIELDS = ("customer_id", "id_card", "name", "tel")
 
 CAR_FMT = "<i12s12s16siiii"
-CAR_SIZE = struct.calcsize(CAR_FMT)
+CAR_S = struct.Struct(CAR_FMT)
+CAR_SIZE = CAR_S.size
 CAR_FIELDS = (
     "car_id",
     "plate",
@@ -28,7 +32,8 @@ CAR_FIELDS = (
 )
 
 RENT_FMT = "<iiiIIiif"
-RENT_SIZE = struct.calcsize(RENT_FMT)
+RENT_S = struct.Struct(RENT_FMT)
+RENT_SIZE = RENT_S.size
 RENT_FIELDS = (
     "rental_id",
     "car_id",
@@ -40,6 +45,9 @@ RENT_FIELDS = (
     "total_amount",
 )
 
+# every record starts with its int32 primary key
+ID_S = struct.Struct("<i")
+
 # ===== Status conventions =====
 CAR_ACTIVE, CAR_INACTIVE = 1, 0
 RENT_OPEN, RENT_CLOSED, RENT_DELETED = 1, 0, -1
@@ -67,13 +75,8 @@ def fit_bytes(s: str, n: int) -> bytes:
     b = s.encode("utf-8", errors="ignore")
     if len(b) <= n:
         return b.ljust(n, b" ")
-    view = b[:n]
-    while True:
-        try:
-            view.decode("utf-8")
-            break
-        except UnicodeDecodeError:
-            view = view[:-1]
+    # "ignore" drops a multi-byte char cut at the boundary in one pass
+    view = b[:n].decode("utf-8", "ignore").encode("utf-8")
     return view.ljust(n, b" ")
 
 
@@ -88,10 +91,20 @@ def ymd(i: int) -> date:
     return date(y, m, d)
 
 
+# same output as strftime("%m/%d/%Y") on Windows and "%-m/%-d/%Y" elsewhere
+REPORT_DATE_FMT = "{m:02d}/{d:02d}/{y}" if sys.platform == "win32" else "{m}/{d}/{y}"
+
+
+# many rentals share dates, so each distinct day is formatted once
+@lru_cache(maxsize=None)
+def report_date(i: int) -> str:
+    return REPORT_DATE_FMT.format(y=i // 10000, m=(i // 100) % 100, d=i % 100)
+
+
 def ask_int(prompt: str, minv=None, maxv=None) -> int:
     while True:
         try:
-            v = int(input(prompt).strip())
+            v = int(input(prompt))  # int() already ignores surrounding whitespace
             if minv is not None and v < minv:
                 raise ValueError
             if maxv is not None and v > maxv:
@@ -108,44 +121,136 @@ def ask_str(prompt: str, max_bytes: int) -> str:
     return s
 
 
+# "YYYY-MM-DD" -> YYYYMMDD int; raises ValueError/OverflowError if invalid
+def parse_ymd(raw: str) -> int:
+    y, m, d = map(int, raw.split("-"))
+    date(y, m, d)  # calendar check: ymd() must be able to rebuild it later
+    return y * 10000 + m * 100 + d
+
+
 def ask_ymd(prompt: str) -> int:
     while True:
-        raw = input(prompt + " (YYYY-MM-DD): ").strip()
+        raw = input(prompt + " (YYYY-MM-DD): ")
         try:
-            y, m, d = map(int, raw.split("-"))
-            date(y, m, d)
-            return y * 10000 + m * 100 + d
-        except Exception:
+            return parse_ymd(raw)
+        except (ValueError, OverflowError):
             print("  ! รูปแบบวันที่ไม่ถูกต้อง")
 
 
 # ===== Low-level IO =====
-def read_all(path: str, fmt: str, fields: tuple, rec_size: int) -> list[dict]:
-    out = []
-    with open(path, "rb") as f:
-        while True:
-            blob = f.read(rec_size)
-            if not blob:
-                break
-            if len(blob) != rec_size:
-                break
-            vals = list(struct.unpack(fmt, blob))
-            for i, v in enumerate(vals):
-                if isinstance(v, (bytes, bytearray)):
-                    vals[i] = b2s(v)
-            out.append(dict(zip(fields, vals)))
-    return out
-
-
-def append_record(path: str, fmt: str, tup: tuple):
-    with open(path, "ab") as f:
-        f.write(struct.pack(fmt, *tup))
-
-
-def write_record_by_index(path: str, fmt: str, tup: tuple, rec_size: int, index: int):
-    with open(path, "r+b") as f:
-        f.seek(index * rec_size)
-        f.write(struct.pack(fmt, *tup))
+@lru_cache(maxsize=None)
+def text_slots(fmt: str) -> tuple:
+    # positions of the fixed-length string fields in a record layout
+    blank = struct.unpack(fmt, bytes(struct.calcsize(fmt)))
+    return tuple(i for i, v in enumerate(blank) if isinstance(v, bytes))
+
+
+def to_row(s: struct.Struct, fields: tuple, vals: tuple) -> dict:
+    text = text_slots(s.format)
+    if not text:
+        return dict(zip(fields, vals))
+    vals = list(vals)
+    for i in text:
+        vals[i] = b2s(vals[i])
+    return dict(zip(fields, vals))
+
+
+# read-only mmap over a fixed-length record file
+class MappedTable:
+    def __init__(self, path: str, s: struct.Struct, fields: tuple):
+        self.path, self.s, self.fields = path, s, fields
+        self._f = self._mm = None
+        self._n = 0
+
+    def __enter__(self):
+        self._f = open(self.path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        self._n = size // self.s.size
+        if self._n:  # mmap refuses empty files
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *exc):
+        if self._mm is not None:
+            self._mm.close()
+        self._f.close()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> dict:
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return to_row(self.s, self.fields, self.s.unpack_from(self._mm, i * self.s.size))
+
+    # slot of the last record whose key matches, or -1; reads only the keys
+    def find(self, key: int) -> int:
+        step, mm = self.s.size, self._mm
+        for i in range(self._n - 1, -1, -1):
+            if ID_S.unpack_from(mm, i * step)[0] == key:
+                return i
+        return -1
+
+    def rows(self) -> list[dict]:
+        if not self._n:
+            return []
+        # ignore a trailing partial record, as the old per-record reader did
+        with memoryview(self._mm)[: self._n * self.s.size] as whole:
+            return [to_row(self.s, self.fields, v) for v in self.s.iter_unpack(whole)]
+
+
+def read_all(path: str, s: struct.Struct, fields: tuple) -> list[dict]:
+    with MappedTable(path, s, fields) as t:
+        return t.rows()
+
+
+# fds kept open for the session, one per (path, flags), closed at exit;
+# each remembers the file it was opened on so a replaced file gets reopened
+_FDS: dict[tuple, tuple] = {}
+
+
+def _fd(path: str, flags: int) -> int:
+    try:
+        st = os.stat(path)
+        on_disk = st.st_dev, st.st_ino
+    except FileNotFoundError:  # deleted under us; O_CREAT opens may recreate it
+        on_disk = None
+    held = _FDS.get((path, flags))
+    if held is not None:
+        fd, dev, ino = held
+        if (dev, ino) == on_disk:
+            return fd
+        os.close(fd)
+        del _FDS[path, flags]
+    fd = os.open(path, flags | getattr(os, "O_BINARY", 0), 0o666)
+    st = os.fstat(fd)
+    _FDS[path, flags] = fd, st.st_dev, st.st_ino
+    return fd
+
+
+@atexit.register
+def _close_fds():
+    for fd, _, _ in _FDS.values():
+        os.close(fd)
+    _FDS.clear()
+
+
+def append_records(path: str, data: bytes):
+    # O_APPEND puts every write at the current end of file; O_CREAT keeps
+    # the old open(path, "ab") behaviour if the file was removed mid-session
+    fd = _fd(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def write_record_by_index(path: str, blob: bytes, index: int):
+    if not hasattr(os, "pwrite"):  # Windows
+        with open(path, "r+b") as f:
+            f.seek(index * len(blob))
+            f.write(blob)
+        return
+    os.pwrite(_fd(path, os.O_RDWR), blob, index * len(blob))
 
 
 # ===== Converters dict<->tuple =====
@@ -188,29 +293,152 @@ def index_by_key(rows: list[dict], key: str) -> dict:
     return {r[key]: (i, r) for i, r in enumerate(rows)}
 
 
+# ===== Tables (loaded once per session) =====
+class Table:
+    def __init__(self, path: str, s: struct.Struct, fields: tuple, pack):
+        self.path, self.s, self.fields, self.pack = path, s, fields, pack
+        self.key = fields[0]
+        self._rows = None
+        self._idx = None
+        self._seen = None
+        self._cols = {}
+
+    def _stamp(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:  # never matches a real stamp
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    # cache is valid while the file looks the same as when we last touched it
+    def _fresh(self) -> bool:
+        return self._rows is not None and self._stamp() == self._seen
+
+    def _drop(self):
+        self._rows = self._idx = self._seen = None
+        self._cols = {}
+
+    def rows(self) -> list[dict]:
+        if not self._fresh():
+            stamp = self._stamp()
+            self._rows = read_all(self.path, self.s, self.fields)
+            self._idx, self._seen, self._cols = None, stamp, {}
+        return self._rows
+
+    # one int field of every row as a contiguous array, for counts and scans
+    def column(self, name: str) -> array:
+        rows = self.rows()
+        col = self._cols.get(name)
+        if col is None:
+            col = self._cols[name] = array("i", (r[name] for r in rows))
+        return col
+
+    # {id: (slot, row)}, kept in step by append/update
+    def index(self) -> dict:
+        rows = self.rows()
+        if self._idx is None:
+            self._idx = index_by_key(rows, self.key)
+        return self._idx
+
+    # (slot, row) or None; with nothing cached, scan ids on the mapping and
+    # decode only the matching record instead of loading the whole table
+    def get(self, key: int):
+        if self._fresh():
+            return self.index().get(key)
+        with MappedTable(self.path, self.s, self.fields) as t:
+            i = t.find(key)  # last wins, like index_by_key
+            return (i, t[i]) if i >= 0 else None
+
+    # duplicate-key check: O(1) on the index when cached, otherwise a scan
+    # of the int32 keys that decodes no strings
+    def has(self, key: int) -> bool:
+        if self._fresh():
+            return key in self.index()
+        with MappedTable(self.path, self.s, self.fields) as t:
+            return t.find(key) >= 0
+
+    # each record is packed once; the same bytes are written and decoded
+    # back, so the cache holds what a reload would see (fit_bytes
+    # trimming, float32 amounts)
+    def _encode(self, d: dict) -> bytes:
+        return self.s.pack(*self.pack(d))
+
+    def _decode(self, blob: bytes) -> dict:
+        return to_row(self.s, self.fields, self.s.unpack(blob))
+
+    def append(self, d: dict):
+        self.extend([d])
+
+    # batch add: one open + one write for all records
+    def extend(self, ds: list[dict]):
+        size = self.s.size
+        buf = bytearray(len(ds) * size)
+        for i, d in enumerate(ds):
+            self.s.pack_into(buf, i * size, *self.pack(d))
+        fresh = self._fresh()
+        append_records(self.path, buf)
+        if not fresh:  # the next load reads them back
+            self._drop()
+            return
+        self._cols = {}
+        for vals in self.s.iter_unpack(buf):
+            row = to_row(self.s, self.fields, vals)
+            self._rows.append(row)
+            if self._idx is not None:
+                self._idx[row[self.key]] = (len(self._rows) - 1, row)
+        self._seen = self._stamp()
+
+    # write-through: only the changed slot is rewritten on disk.
+    # rows() entries are shared, so callers edit a copy and pass it here.
+    def update(self, i: int, d: dict):
+        blob = self._encode(d)
+        fresh = self._fresh()
+        write_record_by_index(self.path, blob, i)
+        if not fresh:
+            self._drop()
+            return
+        self._cols = {}
+        row = self._rows[i] = self._decode(blob)
+        if self._idx is not None:
+            self._idx[row[self.key]] = (i, row)
+        self._seen = self._stamp()
+
+
+CUSTOMERS = Table(CUST_PATH, CUSTOMER_S, CUSTOMER_FIELDS, pack_customer)
+CARS = Table(CAR_PATH, CAR_S, CAR_FIELDS, pack_car)
+RENTALS = Table(RENT_PATH, RENT_S, RENT_FIELDS, pack_rent)
+
+
 # ===== Pretty print =====
+def row_template(widths: list[int]) -> str:
+    # one str.format call per row instead of a join over per-cell ljust()
+    return " | ".join(f"{{:<{w}}}" for w in widths)
+
+
+def col_widths(headers: list[str], str_rows: list[list[str]]) -> list[int]:
+    widths = [len(h) for h in headers]
+    for i, col in enumerate(zip(*str_rows)):
+        widths[i] = max(widths[i], *map(len, col))
+    return widths
+
+
 def print_table(headers: list[str], rows: list[list[str]]):
     if not rows:
         print("  (ว่าง)")
         return
-    widths = [len(h) for h in headers]
-    for r in rows:
-        for i, c in enumerate(r):
-            widths[i] = max(widths[i], len(str(c)))
+    str_rows = [list(map(str, r)) for r in rows]
+    widths = col_widths(headers, str_rows)
     sep_len = sum(widths) + 3 * (len(widths) - 1)
-    line = "-" * sep_len
-    print(" | ".join(h.ljust(widths[i]) for i, h in enumerate(headers)))
-    print(line)
-    for r in rows:
-        print(" | ".join(str(c).ljust(widths[i]) for i, c in enumerate(r)))
+    tpl = row_template(widths)
+    out = [tpl.format(*headers), "-" * sep_len]
+    out.extend(tpl.format(*r) for r in str_rows)
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ===== CRUD =====
 def add_customer():
-    rows = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
-    idx = index_by_key(rows, "customer_id")
     cid = ask_int("Customer ID: ", 1)
-    if cid in idx:
+    if CUSTOMERS.has(cid):
         print("  ! ซ้ำ")
         return
     d = {
@@ -219,15 +447,13 @@ def add_customer():
         "name": ask_str("Name : ", 60),
         "tel": ask_str("Tel : ", 12),
     }
-    append_record(CUST_PATH, CUSTOMER_FMT, pack_customer(d))
+    CUSTOMERS.append(d)
     print("  ✓ บันทึกลูกค้าแล้ว")
 
 
 def add_car():
-    rows = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-    idx = index_by_key(rows, "car_id")
     cid = ask_int("Car ID: ", 1)
-    if cid in idx:
+    if CARS.has(cid):
         print("  ! ซ้ำ")
         return
     d = {
@@ -240,21 +466,15 @@ def add_car():
         "status": CAR_ACTIVE,
         "is_rented": 0,
     }
-    append_record(CAR_PATH, CAR_FMT, pack_car(d))
+    CARS.append(d)
     print("  ✓ บันทึกรถแล้ว")
 
 
 def add_rental():
-    cars = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-    customers = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
-    rents = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
-    car_idx, cust_idx = index_by_key(cars, "car_id"), index_by_key(
-        customers, "customer_id"
-    )
-    rent_ids = set(r["rental_id"] for r in rents)
+    car_idx, cust_idx = CARS.index(), CUSTOMERS.index()
 
     rid = ask_int("Rental ID: ", 1)
-    if rid in rent_ids:
+    if rid in RENTALS.index():
         print("  ! ซ้ำ")
         return
     car_id = ask_int("Car ID: ", 1)
@@ -265,7 +485,8 @@ def add_rental():
     if cust_id not in cust_idx:
         print("  ! customer_id ไม่พบ")
         return
-    if car_idx[car_id][1]["status"] != CAR_ACTIVE:
+    i_car, car_row = car_idx[car_id]
+    if car_row["status"] != CAR_ACTIVE:
         print("  ! รถไม่อยู่สถานะ Active")
         return
 
@@ -276,12 +497,11 @@ def add_rental():
         return
 
     days = (ed - sd).days + 1
-    rate = car_idx[car_id][1]["rate"]
+    rate = car_row["rate"]
     total = float(days * rate)
 
     # overlap check (non-deleted)
-    existing = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
-    for r in existing:
+    for r in RENTALS.rows():
         if r["car_id"] != car_id or r["status"] == RENT_DELETED:
             continue
         if r["start_ymd"] <= end and r["end_ymd"] >= start:
@@ -298,39 +518,37 @@ def add_rental():
         "status": RENT_OPEN,
         "total_amount": total,
     }
-    append_record(RENT_PATH, RENT_FMT, pack_rent(d))
+    RENTALS.append(d)
 
     # mark car as rented
-    i_car, car_row = car_idx[car_id]
-    car_row["is_rented"] = 1
-    write_record_by_index(CAR_PATH, CAR_FMT, pack_car(car_row), CAR_SIZE, i_car)
+    CARS.update(i_car, dict(car_row, is_rented=1))
     print(f"  ✓ บันทึกเช่าแล้ว (Amount {total:.2f})")
 
 
 def update_entity(entity: str):
     if entity == "customer":
-        rows = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
-        idx = index_by_key(rows, "customer_id")
-        if not rows:
+        idx = CUSTOMERS.index()
+        if not idx:
             print("  (ว่าง)"); return
         k = ask_int("Customer ID ที่จะแก้: ", 1)
         if k not in idx:
             print("  ! ไม่พบ"); return
         i, cur = idx[k]
+        cur = cur.copy()
         cur["name"] = input(f"Name [{cur['name']}]: ").strip() or cur["name"]
         cur["tel"]  = input(f"Tel  [{cur['tel']}]: ").strip() or cur["tel"]
-        write_record_by_index(CUST_PATH, CUSTOMER_FMT, pack_customer(cur), CUSTOMER_SIZE, i)
+        CUSTOMERS.update(i, cur)
         print("  ✓ อัปเดตแล้ว")
 
     elif entity == "car":
-        rows = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-        idx = index_by_key(rows, "car_id")
-        if not rows:
+        idx = CARS.index()
+        if not idx:
             print("  (ว่าง)"); return
         k = ask_int("Car ID ที่จะแก้: ", 1)
         if k not in idx:
             print("  ! ไม่พบ"); return
         i, cur = idx[k]
+        cur = cur.copy()
 
         # 👉 เพิ่มการแก้ไขป้ายทะเบียน (plate)
         plate = input(f"Plate [{cur['plate']}]: ").strip() or cur["plate"]
@@ -348,46 +566,43 @@ def update_entity(entity: str):
         cur["plate"] = plate             # <- บันทึกค่า plate ที่แก้
         cur["brand"], cur["model"] = brand, model
 
-        write_record_by_index(CAR_PATH, CAR_FMT, pack_car(cur), CAR_SIZE, i)
+        CARS.update(i, cur)
         print("  ✓ อัปเดตแล้ว")
 
     elif entity == "rental":
-        rows = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
-        idx = index_by_key(rows, "rental_id")
-        if not rows:
+        idx = RENTALS.index()
+        if not idx:
             print("  (ว่าง)"); return
         k = ask_int("Rental ID ที่จะแก้: ", 1)
         if k not in idx:
             print("  ! ไม่พบ"); return
         i, cur = idx[k]
+        cur = cur.copy()
         status = input(f"Status(1=Open,0=Closed,-1=Deleted) [{cur['status']}]: ").strip()
         if status!="": cur["status"] = int(status)
         s_in = input(f"Start [{ymd(cur['start_ymd'])} YYYY-MM-DD or blank]: ").strip()
         e_in = input(f"End   [{ymd(cur['end_ymd'])} YYYY-MM-DD or blank]: ").strip()
-        if s_in:
-            y,m,d = map(int, s_in.split("-")); cur["start_ymd"] = y*10000+m*100+d
-        if e_in:
-            y,m,d = map(int, e_in.split("-")); cur["end_ymd"] = y*10000+m*100+d
+        if s_in: cur["start_ymd"] = parse_ymd(s_in)
+        if e_in: cur["end_ymd"] = parse_ymd(e_in)
         sd, ed = ymd(cur["start_ymd"]), ymd(cur["end_ymd"])
         if ed < sd:
             print("  ! end < start"); return
         cur["total_days"] = (ed - sd).days + 1
-        cars = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-        car_idx = index_by_key(cars, "car_id")
-        rate = car_idx.get(cur["car_id"], (None, {"rate": 0}))[1]["rate"]
+        car = CARS.get(cur["car_id"])
+        rate = car[1]["rate"] if car else 0
         cur["total_amount"] = float(cur["total_days"] * rate)
-        write_record_by_index(RENT_PATH, RENT_FMT, pack_rent(cur), RENT_SIZE, i)
+        RENTALS.update(i, cur)
         print("  ✓ อัปเดตแล้ว")
 
-        if cur["car_id"] in car_idx:
-            i_car, car_row = car_idx[cur["car_id"]]
-            car_row["is_rented"] = 1 if cur["status"] == RENT_OPEN else 0
-            write_record_by_index(CAR_PATH, CAR_FMT, pack_car(car_row), CAR_SIZE, i_car)
+        if car:
+            i_car, car_row = car
+            rented = 1 if cur["status"] == RENT_OPEN else 0
+            CARS.update(i_car, dict(car_row, is_rented=rented))
 
 
 def delete_entity(entity: str):
     if entity in ("customer", "car"):
-        rents = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
+        rents = RENTALS.rows()
         key = "customer_id" if entity == "customer" else "car_id"
         target_id = ask_int(
             f"{'Customer' if entity=='customer' else 'Car'} ID ที่จะลบ (จะตั้ง Inactive): ",
@@ -396,26 +611,23 @@ def delete_entity(entity: str):
         if any(r[key] == target_id and r["status"] != RENT_DELETED for r in rents):
             print("  ! ยังมีรายการเชื่อมโยงอยู่ (ห้ามลบ) -> จะตั้งสถานะ Inactive")
         if entity == "customer":
-            rows = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
-            idx = index_by_key(rows, "customer_id")
-            if target_id not in idx:
+            if target_id not in CUSTOMERS.index():
                 print("  ! ไม่พบ")
                 return
             print("  ✓ ทำเครื่องหมายแล้ว (ลูกค้าไม่มี status; ข้ามการลบ)")
         else:
-            rows = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-            idx = index_by_key(rows, "car_id")
+            idx = CARS.index()
             if target_id not in idx:
                 print("  ! ไม่พบ")
                 return
             i, cur = idx[target_id]
+            cur = cur.copy()
             cur["status"] = CAR_INACTIVE
-            write_record_by_index(CAR_PATH, CAR_FMT, pack_car(cur), CAR_SIZE, i)
+            CARS.update(i, cur)
             print("  ✓ ตั้งรถเป็น Inactive แล้ว")
     else:
-        rows = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
-        idx = index_by_key(rows, "rental_id")
-        if not rows:
+        idx = RENTALS.index()
+        if not idx:
             print("  (ว่าง)")
             return
         k = ask_int("Rental ID ที่จะลบ: ", 1)
@@ -423,8 +635,9 @@ def delete_entity(entity: str):
             print("  ! ไม่พบ")
             return
         i, cur = idx[k]
+        cur = cur.copy()
         cur["status"] = RENT_DELETED
-        write_record_by_index(RENT_PATH, RENT_FMT, pack_rent(cur), RENT_SIZE, i)
+        RENTALS.update(i, cur)
         print("  ✓ ทำเครื่องหมายลบแล้ว (-1)")
 
 
@@ -447,22 +660,16 @@ def view_menu():
 def view_one():
     ent = entity_select()
     if ent == 1:
-        rows = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
-        idx = index_by_key(rows, "customer_id")
         k = ask_int("Customer ID: ", 1)
-        r = idx.get(k)
+        r = CUSTOMERS.get(k)
         print(r[1] if r else "  ! Not found")
     elif ent == 2:
-        rows = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-        idx = index_by_key(rows, "car_id")
         k = ask_int("Car ID: ", 1)
-        r = idx.get(k)
+        r = CARS.get(k)
         print(r[1] if r else "  ! Not found")
     else:
-        rows = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
-        idx = index_by_key(rows, "rental_id")
         k = ask_int("Rental ID: ", 1)
-        r = idx.get(k)
+        r = RENTALS.get(k)
         if not r:
             print("  ! Not found")
             return
@@ -474,11 +681,11 @@ def view_one():
 def view_all():
     ent = entity_select()
     if ent == 1:
-        rows = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
+        rows = CUSTOMERS.rows()
         headers = ["ID", "ID Card", "Name", "Tel"]
         data = [[r["customer_id"], r["id_card"], r["name"], r["tel"]] for r in rows]
     elif ent == 2:
-        rows = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
+        rows = CARS.rows()
         headers = ["ID", "Plate", "Brand", "Model", "Year", "Rate", "Status", "Rented"]
         data = [
             [
@@ -494,7 +701,7 @@ def view_all():
             for r in rows
         ]
     else:
-        rows = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
+        rows = RENTALS.rows()
         headers = ["RID", "Car", "Cust", "Start", "End", "Days", "Status", "Amount"]
         data = [
             [
@@ -513,14 +720,13 @@ def view_all():
 
 
 def view_stats():
-    cars = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-    rents = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
-    custs = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
-    car_active = sum(1 for c in cars if c["status"] == CAR_ACTIVE)
-    car_inact = sum(1 for c in cars if c["status"] == CAR_INACTIVE)
-    rent_open = sum(1 for r in rents if r["status"] == RENT_OPEN)
-    rent_close = sum(1 for r in rents if r["status"] == RENT_CLOSED)
-    rent_del = sum(1 for r in rents if r["status"] == RENT_DELETED)
+    cars = CARS.rows()
+    rents = RENTALS.rows()
+    custs = CUSTOMERS.rows()
+    cs, rs = CARS.column("status"), RENTALS.column("status")
+    car_active, car_inact = cs.count(CAR_ACTIVE), cs.count(CAR_INACTIVE)
+    rent_open, rent_close = rs.count(RENT_OPEN), rs.count(RENT_CLOSED)
+    rent_del = rs.count(RENT_DELETED)
     print("\n--- Summary Stats ---")
     print(f"Customers : {len(custs)}")
     print(f"Cars      : {len(cars)} (Active {car_active}, Inactive {car_inact})")
@@ -531,12 +737,12 @@ def view_stats():
 
 # ===== Report =====
 def generate_report():
-    customers = read_all(CUST_PATH, CUSTOMER_FMT, CUSTOMER_FIELDS, CUSTOMER_SIZE)
-    cars = read_all(CAR_PATH, CAR_FMT, CAR_FIELDS, CAR_SIZE)
-    rents = read_all(RENT_PATH, RENT_FMT, RENT_FIELDS, RENT_SIZE)
+    customers = CUSTOMERS.rows()
+    cars = CARS.rows()
+    rents = RENTALS.rows()
 
-    cust_by = {c["customer_id"]: c for c in customers}
-    car_by = {c["car_id"]: c for c in cars}
+    cust_by, car_by = CUSTOMERS.index(), CARS.index()
+    missing = (None, {})
 
     headers = [
         "Rental_ID",
@@ -551,81 +757,68 @@ def generate_report():
         "Rental Day",
         "Total Price",
     ]
+    live = [r for r in rents if r["status"] != RENT_DELETED]
+    live.sort(key=lambda x: x["rental_id"])
     table = []
-    for r in sorted(rents, key=lambda x: x["rental_id"]):
-        if r["status"] == RENT_DELETED:
-            continue
-        cu = cust_by.get(r["customer_id"], {})
-        ca = car_by.get(r["car_id"], {})
-        sd, ed = ymd(r["start_ymd"]), ymd(r["end_ymd"])
-        date_fmt = "%m/%d/%Y" if sys.platform == "win32" else "%-m/%-d/%Y"
+    # rows are dict(zip(RENT_FIELDS, ...)), so values() follows RENT_FIELDS
+    for rid, car_id, cust_id, s_ymd, e_ymd, days, _, amount in map(dict.values, live):
+        cu = cust_by.get(cust_id, missing)[1]
+        ca = car_by.get(car_id, missing)[1]
         table.append(
             [
-                r["rental_id"],
+                str(rid),
                 cu.get("name", ""),
                 cu.get("tel", ""),
                 ca.get("plate", ""),
                 ca.get("brand", ""),
                 ca.get("model", ""),
                 f"{ca.get('rate',0):,}",
-                sd.strftime(date_fmt),
-                ed.strftime(date_fmt),
-                r["total_days"],
-                f"{r['total_amount']:,.2f}",
+                report_date(s_ymd),
+                report_date(e_ymd),
+                str(days),
+                f"{amount:,.2f}",
             ]
         )
 
-    widths = [len(h) for h in headers]
-    for row in table:
-        for i, c in enumerate(row):
-            widths[i] = max(widths[i], len(str(c)))
-
-    def fmt_row(cols):
-        return " | ".join(str(c).ljust(widths[i]) for i, c in enumerate(cols))
+    widths = col_widths(headers, table)
+    fmt_row = row_template(widths).format
 
-    act_rates = [c["rate"] for c in cars if c["status"] == CAR_ACTIVE]
+    act_rates = array("i", (c["rate"] for c in cars if c["status"] == CAR_ACTIVE))
     minr = min(act_rates) if act_rates else 0
     maxr = max(act_rates) if act_rates else 0
     avgr = int(sum(act_rates) / len(act_rates)) if act_rates else 0
     brand_cnt = Counter(c["brand"] for c in cars)
 
-    buf = io.StringIO()
-    buf.write("Car Rent System - Summary Report\n")
-    buf.write(f"Generated At: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    buf.write(
-        "App Version: 1.0\nEndianness: Little-Endian\nEncoding: UTF-8 (fixed-length)\n\n"
-    )
-
-    if table:
-        buf.write(fmt_row(headers) + "\n")
-        buf.write("-" * (sum(widths) + 3 * (len(widths) - 1)) + "\n")
-        for row in table:
-            buf.write(fmt_row(row) + "\n")
-    else:
-        buf.write("(no rentals)\n")
-
-    rent_open = sum(1 for x in rents if x["status"] == RENT_OPEN)
-    rent_close = sum(1 for x in rents if x["status"] == RENT_CLOSED)
-    rent_del = sum(1 for x in rents if x["status"] == RENT_DELETED)
-
-    buf.write("\n--- Summary ---\n\n")
-    buf.write(f"Customers : {len(customers)}\n")
-    buf.write(
-        f"Cars      : {len(cars)} (Active {sum(1 for c in cars if c['status']==CAR_ACTIVE)}, Inactive {sum(1 for c in cars if c['status']==CAR_INACTIVE)})\n"
-    )
-    buf.write(
-        f"Rentals   : {len(rents)} (Open {rent_open}, Closed {rent_close}, Deleted {rent_del})\n\n"
-    )
-    buf.write("Rate Statistics (Active cars only)\n")
-    buf.write(
-        f"- Min Rate : {minr:,}\n- Max Rate : {maxr:,}\n- Avg Rate : {avgr:,}\n\n"
-    )
-    buf.write("Cars by Brand\n")
-    for b, n in sorted(brand_cnt.items()):
-        buf.write(f"- {b} : {n}\n")
+    cs, rs = CARS.column("status"), RENTALS.column("status")
+    car_active, car_inact = cs.count(CAR_ACTIVE), cs.count(CAR_INACTIVE)
+    rent_open, rent_close = rs.count(RENT_OPEN), rs.count(RENT_CLOSED)
+    rent_del = rs.count(RENT_DELETED)
+
+    # stream straight into the buffered file; no full-report string in memory
+    with open(REPORT_PATH, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.write(
+            "Car Rent System - Summary Report\n"
+            f"Generated At: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            "App Version: 1.0\nEndianness: Little-Endian\nEncoding: UTF-8 (fixed-length)\n\n"
+        )
 
-    with open(REPORT_PATH, "w", encoding="utf-8") as f:
-        f.write(buf.getvalue())
+        if table:
+            f.write(fmt_row(*headers) + "\n")
+            f.write("-" * (sum(widths) + 3 * (len(widths) - 1)) + "\n")
+            f.writelines(fmt_row(*row) + "\n" for row in table)
+        else:
+            f.write("(no rentals)\n")
+
+        f.write(
+            "\n--- Summary ---\n\n"
+            f"Customers : {len(customers)}\n"
+            f"Cars      : {len(cars)} (Active {car_active}, Inactive {car_inact})\n"
+            f"Rentals   : {len(rents)} (Open {rent_open}, Closed {rent_close}, Deleted {rent_del})\n\n"
+            "Rate Statistics (Active cars only)\n"
+            f"- Min Rate : {minr:,}\n- Max Rate : {maxr:,}\n- Avg Rate : {avgr:,}\n\n"
+            "Cars by Brand\n"
+        )
+        f.writelines(f"- {b} : {n}\n" for b, n in sorted(brand_cnt.items()))
     print(f"✓ สร้างรายงานแล้ว -> {REPORT_PATH}")
 
 